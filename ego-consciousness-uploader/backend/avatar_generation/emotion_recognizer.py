@@ -20,6 +20,22 @@ except ImportError:
     WEBSOCKETS_AVAILABLE = False
     websockets = None
 
+# Optional msgpack import for binary WebSocket frames (falls back to JSON + base64)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+# Optional orjson import for faster JSON encoding (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(levelname)s:%(name)s:%(message)s'
@@ -27,6 +43,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(data) -> str:
+    """Serialize data to a JSON string, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+
 class EmotionRecognizer:
     """Real-time emotion recognition using webcam and DeepFace."""
     
@@ -44,8 +67,16 @@ class EmotionRecognizer:
         self.is_running = False
         self.frame_count = 0
         self.process_every_n_frames = 3  # Process every 3rd frame for smooth real-time performance
+        self.stale_frame_grabs = 1  # Extra grabs to drain stale frames if the driver ignores CAP_PROP_BUFFERSIZE
         self.last_emotions = []
         
+        # Welcome message is constant, so serialize it once
+        self._welcome_message = _json_dumps({
+            'type': 'connection',
+            'message': 'Connected to emotion recognition service',
+            'status': 'ready'
+        })
+        
     def initialize_camera(self) -> bool:
         """
         Initialize the webcam.
@@ -64,6 +95,12 @@ class EmotionRecognizer:
             self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.camera.set(cv2.CAP_PROP_FPS, 30)
+            # Keep only the newest frame in the driver queue so we never process stale frames
+            buffer_size_honoured = (self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                                    and self.camera.get(cv2.CAP_PROP_BUFFERSIZE) == 1)
+            # With a one-frame buffer there's nothing stale to drain, and an extra
+            # grab() would just block waiting for the next frame
+            self.stale_frame_grabs = 0 if buffer_size_honoured else 1
             
             logger.info("Camera initialized successfully")
             return True
@@ -78,6 +115,22 @@ class EmotionRecognizer:
             self.camera.release()
             logger.info("Camera released")
     
+    def read_latest_frame(self):
+        """
+        Read the freshest available frame from the camera.
+        
+        grab() only advances the capture without decoding. When the driver ignores
+        the one-frame buffer hint, frames that piled up while inference was running
+        are skipped with extra grabs and only the newest one is decoded with retrieve().
+        
+        Returns:
+            Tuple of (success, frame) like cv2.VideoCapture.read()
+        """
+        for _ in range(self.stale_frame_grabs + 1):
+            if not self.camera.grab():
+                return False, None
+        return self.camera.retrieve()
+    
     def detect_emotions(self, frame: np.ndarray) -> List[Dict]:
         """
         Detect emotions in a frame using SSD for face detection and DeepFace for emotion analysis.
@@ -250,25 +303,64 @@ class EmotionRecognizer:
         
         return annotated_frame
     
-    def frame_to_base64(self, frame: np.ndarray) -> str:
+    def frame_to_jpeg(self, frame: np.ndarray) -> bytes:
         """
-        Convert OpenCV frame to base64 string.
+        Convert OpenCV frame to JPEG bytes.
         
         Args:
             frame: OpenCV frame
             
         Returns:
-            Base64 encoded JPEG string
+            JPEG encoded bytes
         """
         try:
             # Encode frame as JPEG with good quality for clear video
             _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 75])
-            # Convert to base64
-            base64_str = base64.b64encode(buffer).decode('utf-8')
-            return base64_str
+            return buffer.tobytes()
         except Exception as e:
             logger.error(f"Error encoding frame: {e}")
-            return ""
+            return b""
+    
+    def frame_to_base64(self, frame: np.ndarray) -> str:
+        """
+        Convert OpenCV frame to base64 string.
+        
+        Args:
+            frame: OpenCV frame
+            
+        Returns:
+            Base64 encoded JPEG string
+        """
+        return base64.b64encode(self.frame_to_jpeg(frame)).decode('utf-8')
+    
+    def encode_frame_message(self, frame: np.ndarray, emotions: List[Dict]):
+        """
+        Build the emotion_frame message for a client.
+        
+        Uses MessagePack with raw JPEG bytes when available, which avoids
+        base64 expansion and JSON string escaping on every frame.
+        
+        Args:
+            frame: Annotated OpenCV frame
+            emotions: List of detected emotions
+            
+        Returns:
+            MessagePack bytes (binary frame) or JSON string (text frame)
+        """
+        if MSGPACK_AVAILABLE:
+            return msgpack.packb({
+                'type': 'emotion_frame',
+                'frame': self.frame_to_jpeg(frame),
+                'emotions': emotions,
+                'timestamp': time.time()
+            }, use_bin_type=True)
+        
+        return _json_dumps({
+            'type': 'emotion_frame',
+            'frame': self.frame_to_base64(frame),
+            'emotions': emotions,
+            'timestamp': time.time()
+        })
     
     async def handle_client(self, websocket):
         """
@@ -281,18 +373,20 @@ class EmotionRecognizer:
         
         try:
             # Send welcome message
-            welcome = {
-                'type': 'connection',
-                'message': 'Connected to emotion recognition service',
-                'status': 'ready'
-            }
-            await websocket.send(json.dumps(welcome))
+            await websocket.send(self._welcome_message)
             
             # Keep sending frames while connected
             while self.is_running:
                 try:
-                    # Read frame from camera
-                    ret, frame = self.camera.read()
+                    # Process emotions every N frames for performance
+                    process_frame = (self.frame_count + 1) % self.process_every_n_frames == 0
+                    
+                    # Only decode frames we're going to process; grab() alone keeps the
+                    # camera advancing on skipped frames without paying for retrieve()
+                    if process_frame:
+                        ret, frame = self.read_latest_frame()
+                    else:
+                        ret, frame = self.camera.grab(), None
                     if not ret:
                         logger.error("Failed to read frame from camera")
                         await asyncio.sleep(0.1)
@@ -300,8 +394,7 @@ class EmotionRecognizer:
                     
                     self.frame_count += 1
                     
-                    # Process emotions every N frames for performance
-                    if self.frame_count % self.process_every_n_frames == 0:
+                    if process_frame:
                         # Detect emotions
                         emotions = self.detect_emotions(frame)
                         self.last_emotions = emotions
@@ -309,19 +402,11 @@ class EmotionRecognizer:
                         # Draw emotions on frame
                         annotated_frame = self.draw_emotions_on_frame(frame, emotions)
                         
-                        # Convert frame to base64
-                        frame_base64 = self.frame_to_base64(annotated_frame)
-                        
-                        # Prepare data to send
-                        data = {
-                            'type': 'emotion_frame',
-                            'frame': frame_base64,
-                            'emotions': emotions,
-                            'timestamp': time.time()
-                        }
+                        # Encode frame and emotions into a single message
+                        payload = self.encode_frame_message(annotated_frame, emotions)
                         
                         # Send to client
-                        await websocket.send(json.dumps(data))
+                        await websocket.send(payload)
                         if emotions:
                             logger.info(f"✓ Sent emotion data: {len(emotions)} face(s), dominant: {emotions[0]['dominant_emotion']}")
                         else:
@@ -362,7 +447,8 @@ class EmotionRecognizer:
                 self.handle_client, 
                 self.host, 
                 self.port,
-                reuse_port=True  # Allow port reuse
+                reuse_port=True,  # Allow port reuse
+                compression=None  # JPEG frames don't deflate, compression only costs CPU
             )
             
             server = await start_server
@@ -844,8 +930,10 @@ if __name__ == "__main__":
             print("python backend/emotion_recognizer.py capture")
             sys.exit(1)
         
+        from event_loop import run_event_loop
+        
         try:
-            asyncio.run(main())
+            run_event_loop(main())
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
 
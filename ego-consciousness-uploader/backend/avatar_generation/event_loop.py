@@ -0,0 +1,20 @@
+"""
+Shared event loop runner for the asyncio entry points
+"""
+
+import asyncio
+
+# Optional uvloop import for a faster event loop (falls back to asyncio's default loop)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
+
+
+def run_event_loop(coro):
+    """Run a coroutine to completion, on uvloop's event loop when available."""
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
@@ -4,57 +4,125 @@ Fixed WebSocket server - correct function signature.
 """
 
 import asyncio
+import functools
+import os
+import sys
 import websockets
-import json
 import logging
+from urllib.parse import parse_qs, urlparse
 
-logging.basicConfig(level=logging.INFO)
+import msgpack
+import orjson
+
+# Add the avatar generation directory to Python path for the shared event loop runner
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend', 'avatar_generation'))
+
+from event_loop import run_event_loop
+
+# Keep third-party loggers at WARNING; our startup messages stay at INFO and
+# per-connection messages are DEBUG so accepts don't pay for log formatting and I/O
+logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Cap on concurrently served clients - extra connections are turned away instead of piling up
+MAX_CLIENTS = 256
+
+
+def _wants_json(websocket) -> bool:
+    """Check whether the client opted into JSON frames with ?format=json (for debugging)."""
+    request = getattr(websocket, 'request', None)
+    path = request.path if request is not None else getattr(websocket, 'path', '')
+    return parse_qs(urlparse(path).query).get('format') == ['json']
+
+
+def _encode_frame(data, use_json: bool = False):
+    """Encode a frame as MessagePack bytes (binary frame), or JSON text when requested."""
+    if use_json:
+        # Decode so JSON still goes out as a text frame
+        return orjson.dumps(data).decode()
+    return msgpack.packb(data, use_bin_type=True)
 
-async def handle_client(websocket):
+
+# Welcome message is constant, so serialize it once per process
+_WELCOME_MESSAGE = orjson.dumps({
+    'type': 'connection',
+    'message': 'Connected to emotion recognition service',
+    'status': 'ready'
+}).decode()
+
+# Test emotion data is constant too, so pre-encode both frame formats
+_TEST_EMOTION = {
+    'type': 'emotion_frame',
+    'frame': '',  # Empty for now
+    'emotions': [{
+        'dominant_emotion': 'happy',
+        'emotion': {'happy': 0.8, 'sad': 0.1, 'angry': 0.1}
+    }],
+    'timestamp': 0
+}
+_TEST_EMOTION_FRAME = _encode_frame(_TEST_EMOTION)
+_TEST_EMOTION_JSON = _encode_frame(_TEST_EMOTION, use_json=True)
+
+async def handle_client(websocket, connection_limit):
     """Handle WebSocket client connections - FIXED: removed path parameter."""
-    logger.info("Client connected!")
+    # Shed load early once the server is full (1013 = try again later)
+    if connection_limit.locked():
+        logger.warning("Rejecting client: server is at capacity")
+        await websocket.close(1013, "Server busy")
+        return
+    
+    async with connection_limit:
+        await serve_client(websocket)
+
+async def serve_client(websocket):
+    """Send the initial frames to a client and keep the connection open."""
+    logger.debug("Client connected!")
     
     try:
         # Send welcome message
-        welcome = {
-            'type': 'connection',
-            'message': 'Connected to emotion recognition service',
-            'status': 'ready'
-        }
-        await websocket.send(json.dumps(welcome))
-        logger.info("Sent welcome message")
+        await websocket.send(_WELCOME_MESSAGE)
+        logger.debug("Sent welcome message")
         
         # Send test emotion data
-        test_emotion = {
-            'type': 'emotion_frame',
-            'frame': '',  # Empty for now
-            'emotions': [{
-                'dominant_emotion': 'happy',
-                'emotion': {'happy': 0.8, 'sad': 0.1, 'angry': 0.1}
-            }],
-            'timestamp': 0
-        }
-        
-        await websocket.send(json.dumps(test_emotion))
-        logger.info("Sent test emotion data")
+        if _wants_json(websocket):
+            await websocket.send(_TEST_EMOTION_JSON)
+        else:
+            await websocket.send(_TEST_EMOTION_FRAME)
+        logger.debug("Sent test emotion data")
         
         # Keep connection alive
         await websocket.wait_closed()
         
     except websockets.exceptions.ConnectionClosed:
-        logger.info("Client disconnected")
+        logger.debug("Client disconnected")
     except Exception as e:
         logger.error(f"Error: {e}")
     finally:
-        logger.info("Client disconnected")
+        logger.debug("Client disconnected")
 
 async def main():
     """Start WebSocket server."""
     logger.info("Starting WebSocket server on localhost:8765")
     
+    # Created here rather than at import so it binds to the running loop (Python 3.8/3.9)
+    connection_limit = asyncio.Semaphore(MAX_CLIENTS)
+    
     # FIXED: Use the correct WebSocket server setup
-    start_server = websockets.serve(handle_client, "localhost", 8765)
+    # Compression only costs CPU for these small frames on localhost, so disable it
+    start_server = websockets.serve(
+        functools.partial(handle_client, connection_limit=connection_limit),
+        "localhost",
+        8765,
+        compression=None,
+        max_size=2**20,  # Clients only send small control messages
+        write_limit=2**16,  # Bound per-client outgoing buffer for backpressure
+        ping_interval=20,
+        ping_timeout=20,
+        max_queue=32,  # Bound buffered incoming messages per client
+        open_timeout=5,  # Shed clients that stall the handshake
+        close_timeout=1
+    )
     
     async with start_server:
         logger.info("WebSocket server started!")
@@ -70,6 +138,6 @@ if __name__ == "__main__":
     print("-" * 40)
     
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
@@ -23,6 +23,7 @@ class EmotionCaptureClient {
       try {
         console.log(`🔗 Attempting to connect to emotion recognition service (attempt ${retryCount + 1}/${maxRetries + 1})...`);
         this.websocket = new WebSocket('ws://localhost:8765');
+        this.websocket.binaryType = 'arraybuffer';
         
         this.websocket.onopen = () => {
           console.log('✅ Connected to emotion recognition service');
@@ -35,7 +36,10 @@ class EmotionCaptureClient {
 
         this.websocket.onmessage = (event) => {
           try {
-            const data = JSON.parse(event.data);
+            // Binary frames are MessagePack, text frames are JSON
+            const data = typeof event.data === 'string'
+              ? JSON.parse(event.data)
+              : window.decodeMsgpack(event.data);
             this.handleMessage(data);
           } catch (error) {
             console.error('Error parsing WebSocket message:', error);
@@ -19,6 +19,8 @@ Requirements:
 
 import os
 import sys
+import asyncio
+import functools
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
@@ -27,13 +29,16 @@ from dotenv import load_dotenv
 backend_dir = Path(__file__).parent / "backend"
 sys.path.insert(0, str(backend_dir))
 
-# Import our custom modules
-from emotion_recognizer import EmotionCapturer
-from avatar_generator import AvatarGenerator
+# Our custom modules (emotion_recognizer, avatar_generator) pull in cv2, DeepFace,
+# TensorFlow and the Gemini/FAL SDKs, so they're imported inside the steps that use
+# them - check_requirements() can then fail fast without paying that import cost
 
 # Load environment variables
 load_dotenv()
 
+# Max Gemini requests in flight at once when generating emotion variants
+MAX_CONCURRENT_VARIANTS = 4
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -95,6 +100,8 @@ def run_emotion_capture():
     print("=" * 60)
     print()
     
+    from emotion_recognizer import EmotionCapturer
+    
     # Initialize the emotion capturer
     capturer = EmotionCapturer(output_dir='.', stability_frames=15)
     
@@ -115,10 +122,13 @@ def run_emotion_capture():
         return {}
 
 
-def run_avatar_generation(captured_files):
+async def run_avatar_generation(captured_files):
     """
     Generate avatars from captured emotion images.
     
+    Emotion variants only depend on the base portrait, so they're generated
+    concurrently (bounded by MAX_CONCURRENT_VARIANTS to respect API rate limits).
+    
     Args:
         captured_files: Dictionary mapping emotion names to captured image paths
         
@@ -134,6 +144,8 @@ def run_avatar_generation(captured_files):
     gemini_key = os.getenv('GEMINI_API_KEY')
     fal_key = os.getenv('FAL_KEY')
     
+    from avatar_generator import AvatarGenerator
+    
     # Initialize the avatar generator
     generator = AvatarGenerator(gemini_key, fal_key)
     
@@ -152,20 +164,35 @@ def run_avatar_generation(captured_files):
         print(f"✓ Base portrait created: {base_portrait}")
         generated_avatars['neutral'] = base_portrait
         
-        # Generate emotional variants
-        for emotion, capture_path in captured_files.items():
-            if emotion != 'neutral':
+        # Generate emotional variants in parallel
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_VARIANTS)
+        
+        async def generate_variant(emotion, capture_path):
+            async with semaphore:
                 print(f"\n😊 Generating {emotion} expression...")
-                variant = generator.generate_expression_variant(
+                return await loop.run_in_executor(None, functools.partial(
+                    generator.generate_expression_variant,
                     base_portrait, 
                     capture_path, 
                     emotion
-                )
-                if variant:
-                    print(f"✓ {emotion} variant created: {variant}")
-                    generated_avatars[emotion] = variant
-                else:
-                    print(f"✗ Failed to create {emotion} variant")
+                ))
+        
+        emotions = [emotion for emotion in captured_files if emotion != 'neutral']
+        variants = await asyncio.gather(
+            *(generate_variant(emotion, captured_files[emotion]) for emotion in emotions),
+            return_exceptions=True
+        )
+        
+        for emotion, variant in zip(emotions, variants):
+            if isinstance(variant, Exception):
+                logger.error(f"Error generating {emotion} variant: {variant}")
+                print(f"✗ Failed to create {emotion} variant")
+            elif variant:
+                print(f"✓ {emotion} variant created: {variant}")
+                generated_avatars[emotion] = variant
+            else:
+                print(f"✗ Failed to create {emotion} variant")
     else:
         print("✗ Failed to create base portrait")
     
@@ -196,6 +223,8 @@ def run_video_generation(avatar_files):
     gemini_key = os.getenv('GEMINI_API_KEY')
     fal_key = os.getenv('FAL_KEY')
     
+    from avatar_generator import AvatarGenerator
+    
     # Initialize the avatar generator
     generator = AvatarGenerator(gemini_key, fal_key)
     
@@ -240,7 +269,7 @@ def main():
         print("STEP 2: AVATAR GENERATION")
         print("=" * 60)
         
-        generated_avatars = run_avatar_generation(captured_files)
+        generated_avatars = asyncio.run(run_avatar_generation(captured_files))
         
         if not generated_avatars:
             logger.error("❌ Avatar generation failed.")
@@ -4,51 +4,77 @@ Startup script for the emotion recognition service.
 This script starts the Python emotion recognition backend.
 """
 
-import asyncio
 import sys
 import os
+import importlib.util
 import subprocess
 import signal
 import time
 
+# Optional psutil import for in-process port cleanup (falls back to lsof)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
 # Add the backend directory to Python path
 backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
 avatar_gen_dir = os.path.join(backend_dir, 'avatar_generation')
 sys.path.append(backend_dir)
 sys.path.append(avatar_gen_dir)
 
-from avatar_generation.emotion_recognizer import EmotionRecognizer
+from avatar_generation.event_loop import run_event_loop
+
+def find_port_pids(port=8765):
+    """
+    Find the PIDs of processes holding the given port.
+    
+    Uses psutil to read socket tables in-process. macOS only exposes other
+    processes' sockets to root, so fall back to lsof when access is denied.
+    """
+    if PSUTIL_AVAILABLE:
+        try:
+            return {conn.pid for conn in psutil.net_connections(kind='inet')
+                    if conn.laddr and conn.laddr.port == port and conn.pid}
+        except psutil.AccessDenied:
+            pass
+    
+    result = subprocess.run(['lsof', f'-ti:{port}'], capture_output=True, text=True)
+    return {int(pid) for pid in result.stdout.split()}
+
+def kill_port(port=8765):
+    """Kill any other processes holding the given port."""
+    for pid in find_port_pids(port) - {os.getpid()}:
+        try:
+            os.kill(pid, signal.SIGKILL)
+            print(f"Killed process {pid} on port {port}")
+        except ProcessLookupError:
+            pass
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully."""
     print('\nShutting down emotion recognition service...')
     # Kill any processes on port 8765
     try:
-        import subprocess
-        result = subprocess.run(['lsof', '-ti:8765'], capture_output=True, text=True)
-        if result.stdout.strip():
-            pids = result.stdout.strip().split('\n')
-            for pid in pids:
-                if pid:
-                    subprocess.run(['kill', '-9', pid])
-                    print(f"Killed process {pid} on port 8765")
+        kill_port(8765)
     except Exception as e:
         print(f"Error cleaning up port: {e}")
     sys.exit(0)
 
 def check_dependencies():
     """Check if required dependencies are installed."""
-    try:
-        import cv2
-        import deepface
-        import numpy
-        import websockets
+    # find_spec locates each module without executing it
+    missing = [name for name in ('cv2', 'deepface', 'numpy', 'websockets')
+               if importlib.util.find_spec(name) is None]
+    if not missing:
         print("✓ All dependencies are installed")
         return True
-    except ImportError as e:
-        print(f"✗ Missing dependency: {e}")
-        print("Please install dependencies with: pip install -r requirements.txt")
-        return False
+    
+    print(f"✗ Missing dependencies: {', '.join(missing)}")
+    print("Please install dependencies with: pip install -r requirements.txt")
+    return False
 
 async def main():
     """Main function to start the emotion recognition service."""
@@ -59,6 +85,10 @@ async def main():
     if not check_dependencies():
         return
     
+    # Imported only once the check passes, so a missing dependency gets the
+    # message above instead of an ImportError from cv2/DeepFace at startup
+    from avatar_generation.emotion_recognizer import EmotionRecognizer
+    
     # Set up signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     
@@ -82,6 +112,6 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")